@@ -1,136 +1,565 @@
 from flask import Flask, request, jsonify
-import os, requests
+from flask.json.provider import JSONProvider
+import orjson
+import os, re, json, time, hmac, hashlib, queue, threading, requests
+from collections import OrderedDict
+from enum import IntEnum
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeout
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from base64 import b64encode
-from openai import OpenAI
+from functools import lru_cache
+from contextlib import contextmanager
+from datetime import date, timedelta
+from dateparser import DateDataParser
 
-# 🌱 Load environment variables from .env
-load_dotenv()
+# 🌱 Load environment variables from .env (skip when the platform provides them)
+if os.getenv("SKIP_DOTENV") != "1":
+    load_dotenv()
+
+# ⚡ Serialize Flask JSON with orjson
+class ORJSONProvider(JSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 # 🌐 Flask App
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# ⏳ Set whose entries expire after a TTL, capped at maxlen
+# (every entry shares the same TTL, so insertion order is expiry order)
+class TTLSet:
+    def __init__(self, ttl=600, maxlen=10000):
+        self.ttl = ttl
+        self.maxlen = maxlen
+        self._d = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self):
+        # Entries are kept in insertion order, so expired ones sit at the front
+        now = time.monotonic()
+        while self._d and self._d[next(iter(self._d))] < now:
+            self._d.popitem(last=False)
+
+    def _set(self, key):
+        self._d.pop(key, None)
+        self._d[key] = time.monotonic() + self.ttl
+        while len(self._d) > self.maxlen:
+            self._d.popitem(last=False)
+
+    def add(self, key):
+        with self._lock:
+            self._expire()
+            self._set(key)
 
-# ✅ Track handled Slack event IDs
-handled_event_ids = set()
+    def add_if_absent(self, key):
+        # Atomic check-and-add; True if the key was newly added
+        with self._lock:
+            self._expire()
+            if key in self._d:
+                return False
+            self._set(key)
+            return True
+
+    def __contains__(self, key):
+        with self._lock:
+            self._expire()
+            return key in self._d
+
+    def __len__(self):
+        with self._lock:
+            self._expire()
+            return len(self._d)
 
 # 🔐 Environment Variables
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
+SLACK_SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET")
+# Only for local development: SLACK_VERIFY_SIGNATURES=0 accepts unsigned requests
+SLACK_VERIFY_SIGNATURES = os.getenv("SLACK_VERIFY_SIGNATURES") != "0"
 JIRA_EMAIL = os.getenv("JIRA_EMAIL")
 JIRA_API_TOKEN = os.getenv("JIRA_API_TOKEN")
 JIRA_BASE_URL = os.getenv("JIRA_BASE_URL")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+USE_REDIS = os.getenv("USE_REDIS") == "1"
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# 🗄️ Shared state in Redis when running more than one worker process
+EVENT_TTL = 600
+CONVO_TTL = 1800
+# A conversation stuck in CREATING this long lost its finalizer (e.g. worker restart)
+CREATING_TIMEOUT = 120
+if USE_REDIS:
+    import redis
+    # decode_responses must go on the pool; Redis() ignores it when given a pool
+    r = redis.Redis(connection_pool=redis.BlockingConnectionPool.from_url(
+        REDIS_URL, max_connections=32, decode_responses=True
+    ))
+
+# ✅ Track handled Slack event IDs (kept past Slack's retry window)
+handled_event_ids = TTLSet(ttl=EVENT_TTL, maxlen=10000)
+
+# 🔐 True the first time an event ID is seen (across workers with Redis)
+def mark_event_handled(event_id):
+    if USE_REDIS:
+        return bool(r.set(f"slk:evt:{event_id}", "1", nx=True, ex=EVENT_TTL))
+    return handled_event_ids.add_if_absent(event_id)
 
-# 🧠 Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+# ⚡ Common phrasings answered without touching dateparser
+_ISO = re.compile(r"\d{4}-\d{2}-\d{2}")
+_FAST = {
+    "today": 0, "eod": 0, "end of day": 0, "tonight": 0,
+    "tomorrow": 1, "tmrw": 1, "tmr": 1,
+    "day after tomorrow": 2,
+    "next week": 7
+}
+_WEEKDAYS = {
+    name: i for i, names in enumerate((
+        ("monday", "mon"), ("tuesday", "tue", "tues"), ("wednesday", "wed"),
+        ("thursday", "thu", "thurs"), ("friday", "fri"), ("saturday", "sat"), ("sunday", "sun")
+    )) for name in names
+}
+
+# Returns YYYY-MM-DD, "" for input that must be rejected, or None to fall back
+def _fast_due(text, today):
+    if _ISO.fullmatch(text):
+        # Don't let dateparser reinterpret an invalid ISO date (2025-13-01 as Jan 13)
+        try:
+            return date.fromisoformat(text).isoformat()
+        except ValueError:
+            return ""
+    if text in _FAST:
+        return (today + timedelta(days=_FAST[text])).isoformat()
+    # "friday", "this friday", "by friday", "eod friday": the first one after today;
+    # "next friday" skips that one and means the week after
+    words = text.split()
+    if len(words) in (1, 2) and words[-1] in _WEEKDAYS and words[:-1] in ([], ["next"], ["eod"], ["by"], ["this"]):
+        days = (_WEEKDAYS[words[-1]] - today.weekday() - 1) % 7 + 1
+        if words[0] == "next":
+            days += 7
+        return (today + timedelta(days=days)).isoformat()
+    return None
+
+# 📅 Offline due-date parser (English only keeps the locale scan small,
+# and skipping the unused parsers avoids compiling their regexes)
+_DDP = DateDataParser(languages=["en"], settings={
+    "PREFER_DATES_FROM": "future",
+    "RETURN_AS_TIMEZONE_AWARE": False,
+    "PARSERS": ["relative-time", "absolute-time"]
+})
+# Warm up now so the first user doesn't pay for dateparser's setup
+_DDP.get_date_data("tomorrow")
+
+# 📅 Collapse case/whitespace variants so they share a cache entry
+def _norm(text):
+    return " ".join(text.lower().split())
+
+# 📅 Turn free text like "next Friday" into YYYY-MM-DD (None if unparseable)
+def parse_due(text):
+    # Key the cache on today's date so relative phrases don't go stale
+    return _parse_due(_norm(text), date.today())
+
+@lru_cache(maxsize=4096)
+def _parse_due(text, today):
+    fast = _fast_due(text, today)
+    if fast is not None:
+        return fast or None
+    result = _DDP.get_date_data(text)
+    if result and result.date_obj:
+        return result.date_obj.date().isoformat()
+    return None
+
+# 🔐 Jira Basic Auth Header (credentials don't change, so encode once)
+_JIRA_AUTH = "Basic " + b64encode(f"{JIRA_EMAIL}:{JIRA_API_TOKEN}".encode()).decode()
+_JIRA_HEADERS = {"Authorization": _JIRA_AUTH, "Content-Type": "application/json"}
 
-# 🔐 Jira Basic Auth Header
 def get_jira_auth_header():
-    token = f"{JIRA_EMAIL}:{JIRA_API_TOKEN}"
-    return {
-        "Authorization": f"Basic {b64encode(token.encode()).decode()}",
-        "Content-Type": "application/json"
-    }
+    return _JIRA_HEADERS
+
+# ⏱️ (connect, read) timeout for every outbound call, so a hung peer can't stall a thread
+HTTP_TIMEOUT = (3.05, 10)
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=HTTP_TIMEOUT if timeout is None else timeout, **kwargs)
+
+# 🔌 Pooled HTTP sessions (keep-alive across events)
+def make_session(headers, retry):
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = TimeoutHTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+# Slack: re-posting after a rate limit or gateway error is safe, so retry those POSTs too
+slack_session = make_session(
+    {"Authorization": f"Bearer {SLACK_BOT_TOKEN}"},
+    Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504], allowed_methods=frozenset({"POST"}))
+)
+# Jira: only retry failed connects; re-sending a create could duplicate the issue
+jira_session = make_session(_JIRA_HEADERS, Retry(total=3, backoff_factor=0.2))
+
+# 🔏 Check X-Slack-Signature against the raw request body
+_SIGNING_KEY = SLACK_SIGNING_SECRET.encode() if SLACK_SIGNING_SECRET else None
+if not SLACK_VERIFY_SIGNATURES:
+    app.logger.warning("SLACK_VERIFY_SIGNATURES=0; accepting unsigned Slack requests")
+elif _SIGNING_KEY is None:
+    app.logger.error("SLACK_SIGNING_SECRET is not set; every Slack request will be rejected")
+
+def verify_slack_signature(raw, timestamp, signature):
+    # Fail closed when there's no secret to check against
+    if not _SIGNING_KEY or not timestamp or not signature:
+        return False
+    try:
+        # Reject stale requests so captured ones can't be replayed
+        if abs(time.time() - int(timestamp)) > 60 * 5:
+            return False
+    except ValueError:
+        return False
+    mac = hmac.new(_SIGNING_KEY, b"v0:" + timestamp.encode() + b":" + raw, hashlib.sha256).hexdigest()
+    # Compare bytes: compare_digest raises on non-ASCII str input
+    return hmac.compare_digest(("v0=" + mac).encode(), signature.encode())
 
 # ✅ Send a message to Slack
 def send_slack_message(channel_id, message):
-    requests.post(
+    slack_session.post(
         "https://slack.com/api/chat.postMessage",
-        headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"},
         json={"channel": channel_id, "text": message}
     )
 
-# 🧠 Keep state across messages
-conversation_states = {}
+# 📤 Post to Slack without holding up the request thread
+slack_executor = ThreadPoolExecutor(max_workers=4)
+
+def _log_slack_failure(future):
+    error = future.exception()
+    if error is not None:
+        app.logger.error("Failed to send Slack message", exc_info=error)
+
+def send_slack_message_async(channel_id, message):
+    slack_executor.submit(send_slack_message, channel_id, message).add_done_callback(_log_slack_failure)
+
+# 🧱 Jira fields that are the same for every issue
+_JIRA_FIELDS = {
+    "project": {"key": "BT"},
+    "issuetype": {"name": "Task"}
+}
+
+# ✅ Checked locally so bad input never costs a Jira round trip
+_PRIORITIES = frozenset({"Lowest", "Low", "Medium", "High", "Highest"})
+JIRA_SUMMARY_MAX = 255
+
+# 📦 Coalesce Jira issue creation into bulk requests
+JIRA_BATCH_SIZE = 50
+JIRA_BATCH_WINDOW = 0.25
+# Longest wait for a queued issue: one read timeout plus connect retries and backoff
+JIRA_RESULT_TIMEOUT = 30
+_jira_queue = queue.Queue()
+_jira_worker = None
+_jira_worker_lock = threading.Lock()
+
+def _drain(q, max_items, max_wait):
+    batch = [q.get()]
+    # Nothing else waiting: go now rather than holding a lone issue for the window
+    if q.empty():
+        return batch
+    deadline = time.monotonic() + max_wait
+    while len(batch) < max_items:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(q.get(timeout=remaining))
+        except queue.Empty:
+            break
+    return batch
+
+def _post_jira_batch(batch):
+    # Resolves each future with (issue_key, None) or (None, error_text).
+    # Callers that already gave up cancelled their future; don't create those issues.
+    batch = [(fields, future) for fields, future in batch if future.set_running_or_notify_cancel()]
+    if not batch:
+        return
+    if len(batch) == 1:
+        fields, future = batch[0]
+        resp = jira_session.post(f"{JIRA_BASE_URL}/rest/api/3/issue", json={"fields": fields})
+        if resp.status_code == 201:
+            future.set_result((resp.json().get("key"), None))
+        else:
+            future.set_result((None, resp.text))
+        return
+
+    resp = jira_session.post(
+        f"{JIRA_BASE_URL}/rest/api/3/issue/bulk",
+        json={"issueUpdates": [{"fields": fields} for fields, _ in batch]}
+    )
+    try:
+        body = resp.json()
+    except ValueError:
+        body = {}
+    errors = {e.get("failedElementNumber"): e for e in body.get("errors", [])}
+    created = iter(body.get("issues", []))
+    for i, (_, future) in enumerate(batch):
+        if i in errors:
+            future.set_result((None, json.dumps(errors[i].get("elementErrors", errors[i]))))
+            continue
+        issue_key = next(created, {}).get("key")
+        future.set_result((issue_key, None) if issue_key else (None, resp.text))
+
+def _jira_batch_loop():
+    while True:
+        batch = _drain(_jira_queue, JIRA_BATCH_SIZE, JIRA_BATCH_WINDOW)
+        try:
+            _post_jira_batch(batch)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+def create_jira_issue(fields):
+    global _jira_worker
+    # Started lazily so forked server workers each get their own thread
+    with _jira_worker_lock:
+        if _jira_worker is None or not _jira_worker.is_alive():
+            _jira_worker = threading.Thread(target=_jira_batch_loop, daemon=True)
+            _jira_worker.start()
+    future = Future()
+    _jira_queue.put((fields, future))
+    try:
+        return future.result(timeout=JIRA_RESULT_TIMEOUT)
+    except FutureTimeout:
+        if future.cancel():
+            return None, "Timed out waiting for Jira."
+        # Already being posted, so the outcome is unknown
+        return None, None
+
+# 🧭 Conversation steps (what we're waiting on from the user)
+class Step(IntEnum):
+    START = 0
+    SUMMARY = 1
+    DUE = 2
+    PRIORITY = 3
+    CREATING = 4
+
+# 🧠 Keep state across messages, one dict per field (in-process mode)
+step_by_user = {}
+summary_by_user = {}
+due_raw_by_user = {}
+priority_by_user = {}
+creating_until_by_user = {}
+_STATE_DICTS = {
+    "step": step_by_user,
+    "summary": summary_by_user,
+    "due_raw": due_raw_by_user,
+    "priority": priority_by_user,
+    "creating_until": creating_until_by_user
+}
+
+def _convo_key(user_id):
+    return f"slk:convo:{user_id}"
+
+def get_conversation(user_id):
+    if USE_REDIS:
+        # Reading a conversation also extends its TTL
+        with r.pipeline() as pipe:
+            pipe.hgetall(_convo_key(user_id))
+            pipe.expire(_convo_key(user_id), CONVO_TTL)
+            convo, _ = pipe.execute()
+        convo["step"] = Step(int(convo.get("step", Step.START)))
+    else:
+        convo = {name: d[user_id] for name, d in _STATE_DICTS.items() if user_id in d}
+        convo.setdefault("step", Step.START)
+
+    # Nobody is going to finish this issue any more; start over
+    if convo["step"] == Step.CREATING and float(convo.get("creating_until", 0)) < time.time():
+        clear_conversation(user_id)
+        return {"step": Step.START}
+    return convo
+
+def update_conversation(user_id, **fields):
+    if USE_REDIS:
+        mapping = {name: int(v) if name == "step" else v for name, v in fields.items()}
+        with r.pipeline() as pipe:
+            pipe.hset(_convo_key(user_id), mapping=mapping)
+            pipe.expire(_convo_key(user_id), CONVO_TTL)
+            pipe.execute()
+        return
+    for name, value in fields.items():
+        _STATE_DICTS[name][user_id] = value
+
+def clear_conversation(user_id):
+    if USE_REDIS:
+        r.delete(_convo_key(user_id))
+        return
+    for d in _STATE_DICTS.values():
+        d.pop(user_id, None)
+
+# 🔒 Per-user locks so each event advances the conversation exactly once
+# (user_id -> [lock, number of threads holding or waiting on it])
+_user_locks = {}
+_locks_lock = threading.Lock()
+
+@contextmanager
+def user_lock(user_id):
+    if USE_REDIS:
+        with r.lock(f"slk:lock:{user_id}", timeout=30):
+            yield
+        return
+    with _locks_lock:
+        entry = _user_locks.setdefault(user_id, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        # Drop the lock only once nobody holds or is waiting on it
+        with _locks_lock:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _user_locks[user_id]
+
+# 🧵 Background workers for the slow Jira calls
+executor = ThreadPoolExecutor(max_workers=8)
+
+# 🏁 Parse the due date, create the Jira issue and report back to Slack
+def _finalize_issue(user_id, channel_id, summary, due_raw, priority):
+    try:
+        # 📅 Parse the due date locally
+        due_date = parse_due(due_raw)
+        if not due_date:
+            send_slack_message(channel_id, "⚠️ Couldn't understand the due date. Please say something like 'tomorrow' or 'July 2, 2025'.")
+            return
+
+        # 🧱 Build Jira fields on top of the constant skeleton
+        jira_fields = {
+            **_JIRA_FIELDS,
+            "summary": summary,
+            "duedate": due_date,
+            "priority": {"name": priority}
+        }
+
+        # 📩 Send to Jira (batched with other users finishing at the same time)
+        issue_key, error = create_jira_issue(jira_fields)
+
+        # ✅ Response
+        if issue_key:
+            send_slack_message(channel_id, f"✅ Created Jira issue *{issue_key}*: {summary}")
+        elif error is None:
+            send_slack_message(channel_id, f"⏳ Jira is slow to respond; *{summary}* may still be created. Please check Jira before trying again.")
+        else:
+            send_slack_message(channel_id, f"❌ Failed to create Jira issue.\n{error}")
+    except Exception as e:
+        send_slack_message(channel_id, f"❌ Failed to create Jira issue.\n{str(e)}")
+    finally:
+        with user_lock(user_id):
+            if get_conversation(user_id)["step"] == Step.CREATING:
+                clear_conversation(user_id)
+
+# 💬 Prompt sent when the conversation moves to each step, indexed by Step
+_PROMPTS = (
+    None,
+    "📝 What is the task summary?",
+    "📅 When is it due?",
+    "❗ How important is it? (e.g., Low, Medium, High)",
+    None
+)
+
+# 💬 Step handlers, indexed by Step; each returns (next_step, fields, reply)
+def h_start(user_msg):
+    return Step.SUMMARY, {}, None
+
+def h_summary(user_msg):
+    if len(user_msg) > JIRA_SUMMARY_MAX:
+        return Step.SUMMARY, {}, f"✂️ Please keep the summary to at most {JIRA_SUMMARY_MAX} characters."
+    return Step.DUE, {"summary": user_msg}, None
+
+def h_due(user_msg):
+    return Step.PRIORITY, {"due_raw": user_msg}, None
+
+def h_priority(user_msg):
+    priority = user_msg.strip().capitalize()
+    if priority not in _PRIORITIES:
+        return Step.PRIORITY, {}, "❗ Please reply Lowest, Low, Medium, High, or Highest."
+    return Step.CREATING, {"priority": priority, "creating_until": time.time() + CREATING_TIMEOUT}, None
+
+def h_creating(user_msg):
+    return Step.CREATING, {}, "⏳ Still creating your last issue; I'll reply here when it's done."
+
+HANDLERS = (h_start, h_summary, h_due, h_priority, h_creating)
+
+def advance_conversation(user_id, channel_id, user_msg):
+    convo = get_conversation(user_id)
+    step = convo["step"]
+    next_step, fields, reply = HANDLERS[step](user_msg)
+    if next_step == step:
+        if reply:
+            send_slack_message_async(channel_id, reply)
+        return
+
+    update_conversation(user_id, step=next_step, **fields)
+    reply = reply or _PROMPTS[next_step]
+    if reply:
+        send_slack_message_async(channel_id, reply)
+
+    if next_step == Step.CREATING:
+        convo.update(fields)
+        # 🚚 Hand off so Slack gets its 200 within 3s
+        executor.submit(
+            _finalize_issue, user_id, channel_id,
+            convo["summary"], convo["due_raw"], convo["priority"]
+        )
 
 # 📥 Slack Events Endpoint
 @app.route("/slack/events", methods=["POST"])
 def slack_events():
-    data = request.get_json()
+    # 🔁 Slack retries: we already acked the first delivery
+    if request.headers.get("X-Slack-Retry-Num"):
+        return "", 200
+
+    raw = request.get_data(cache=False)
+
+    # 🔏 Verify the request came from Slack
+    if SLACK_VERIFY_SIGNATURES and not verify_slack_signature(
+        raw,
+        request.headers.get("X-Slack-Request-Timestamp"),
+        request.headers.get("X-Slack-Signature")
+    ):
+        return jsonify({"ok": False}), 401
+
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return jsonify({"ok": False}), 400
 
     # ✅ Slack URL verification
     if "challenge" in data:
         return jsonify({"challenge": data["challenge"]}), 200, {'Content-Type': 'application/json'}
 
+    # 🛑 Skip anything that isn't a user message
+    if data.get("type") != "event_callback":
+        return jsonify({"ok": True})
+    event = data.get("event", {})
+    if event.get("type") != "message" or event.get("bot_id") or event.get("subtype") == "bot_message":
+        return jsonify({"ok": True})
+
     # 🔐 Event deduplication
     event_id = data.get("event_id")
-    if event_id in handled_event_ids:
+    if not mark_event_handled(event_id):
         return jsonify({"ok": True})
-    handled_event_ids.add(event_id)
 
-    event = data.get("event", {})
     user_msg = event.get("text", "").strip()
     user_id = event.get("user")
     channel_id = event.get("channel")
 
-    # 🛑 Skip bot or empty messages
-    if not user_msg or "bot_id" in event:
+    # 🛑 Skip empty messages
+    if not user_msg:
         return jsonify({"ok": True})
 
     # 💬 Multi-step conversation
-    convo = conversation_states.get(user_id, {})
-
-    if not convo:
-        conversation_states[user_id] = {"step": "ask_summary"}
-        send_slack_message(channel_id, "📝 What is the task summary?")
-    elif convo["step"] == "ask_summary":
-        convo["summary"] = user_msg
-        convo["step"] = "ask_due"
-        send_slack_message(channel_id, "🗕️ When is it due?")
-    elif convo["step"] == "ask_due":
-        convo["due_raw"] = user_msg
-        convo["step"] = "ask_priority"
-        send_slack_message(channel_id, "❗ How important is it? (e.g., Low, Medium, High)")
-    elif convo["step"] == "ask_priority":
-        convo["priority"] = user_msg.capitalize()
-        convo["step"] = "create_issue"
-
-        # ✅ Use OpenAI to get clean due date
-        try:
-            gpt_due = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "Extract the due date in format YYYY-MM-DD only."},
-                    {"role": "user", "content": convo["due_raw"]}
-                ],
-                max_tokens=10
-            )
-            due_date = gpt_due.choices[0].message.content.strip()
-        except Exception as e:
-            send_slack_message(channel_id, f"❌ GPT error parsing due date: {str(e)}")
-            conversation_states.pop(user_id, None)
-            return jsonify({"ok": True})
-
-        # Simple format check
-        if len(due_date) != 10 or "-" not in due_date:
-            send_slack_message(channel_id, "⚠️ Couldn't understand the due date. Please say something like 'tomorrow' or 'July 2, 2025'.")
-            conversation_states.pop(user_id, None)
-            return jsonify({"ok": True})
-
-        # 🧱 Build Jira payload
-        jira_payload = {
-            "fields": {
-                "project": {"key": "BT"},
-                "summary": convo["summary"],
-                "duedate": due_date,
-                "issuetype": {"name": "Task"}
-            }
-        }
-
-        # 📩 Send to Jira
-        jira_resp = requests.post(
-            f"{JIRA_BASE_URL}/rest/api/3/issue",
-            headers=get_jira_auth_header(),
-            json=jira_payload
-        )
-
-        # ✅ Response
-        if jira_resp.status_code == 201:
-            issue_key = jira_resp.json().get("key")
-            send_slack_message(channel_id, f"✅ Created Jira issue *{issue_key}*: {convo['summary']}")
-        else:
-            send_slack_message(channel_id, f"❌ Failed to create Jira issue.\n{jira_resp.text}")
-
-        conversation_states.pop(user_id, None)
+    with user_lock(user_id):
+        advance_conversation(user_id, channel_id, user_msg)
 
     return jsonify({"ok": True})
 
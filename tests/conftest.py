@@ -0,0 +1,47 @@
+import importlib
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def load_app():
+    # app.py builds its state at import, so each test gets a fresh module
+    sys.modules.pop("app", None)
+    return importlib.import_module("app")
+
+
+@pytest.fixture
+def app_module(monkeypatch):
+    monkeypatch.setenv("SKIP_DOTENV", "1")
+    monkeypatch.delenv("USE_REDIS", raising=False)
+    monkeypatch.setenv("SLACK_VERIFY_SIGNATURES", "0")
+    app = load_app()
+    yield app
+    app.executor.shutdown(wait=True)
+    sys.modules.pop("app", None)
+
+
+def post_message(client, event_id, text, user="U1"):
+    return client.post("/slack/events", data=json.dumps({
+        "type": "event_callback",
+        "event_id": event_id,
+        "event": {"type": "message", "text": text, "user": user, "channel": "C1"}
+    }))
+
+
+def capture_replies(app, monkeypatch, issue_key="BT-1"):
+    # Record Slack replies and Jira fields instead of calling out
+    replies, created = [], []
+    monkeypatch.setattr(app, "send_slack_message_async", lambda channel_id, message: replies.append(message))
+    monkeypatch.setattr(app, "send_slack_message", lambda channel_id, message: replies.append(message))
+
+    def create_jira_issue(fields):
+        created.append(fields)
+        return issue_key, None
+
+    monkeypatch.setattr(app, "create_jira_issue", create_jira_issue)
+    return replies, created
@@ -0,0 +1,80 @@
+from conftest import capture_replies, post_message
+
+
+def test_four_message_flow(app_module, monkeypatch):
+    replies, created = capture_replies(app_module, monkeypatch)
+
+    client = app_module.app.test_client()
+    for i, text in enumerate(["hi", "Fix login", "2030-01-15", "high"]):
+        assert post_message(client, f"E{i}", text).status_code == 200
+    app_module.executor.shutdown(wait=True)
+
+    assert replies == [
+        "📝 What is the task summary?",
+        "📅 When is it due?",
+        "❗ How important is it? (e.g., Low, Medium, High)",
+        "✅ Created Jira issue *BT-1*: Fix login"
+    ]
+    assert created == [{
+        "project": {"key": "BT"},
+        "issuetype": {"name": "Task"},
+        "summary": "Fix login",
+        "duedate": "2030-01-15",
+        "priority": {"name": "High"}
+    }]
+    assert app_module.get_conversation("U1") == {"step": app_module.Step.START}
+    assert app_module._user_locks == {}
+
+
+def test_duplicate_event_is_ignored(app_module, monkeypatch):
+    replies, _ = capture_replies(app_module, monkeypatch)
+    client = app_module.app.test_client()
+
+    post_message(client, "E1", "hi")
+    post_message(client, "E1", "hi")
+
+    assert replies == ["📝 What is the task summary?"]
+
+
+def test_invalid_priority_keeps_step(app_module, monkeypatch):
+    replies, created = capture_replies(app_module, monkeypatch)
+    client = app_module.app.test_client()
+
+    for i, text in enumerate(["hi", "Fix login", "2030-01-15", "urgent"]):
+        post_message(client, f"E{i}", text)
+
+    assert replies[-1] == "❗ Please reply Lowest, Low, Medium, High, or Highest."
+    assert created == []
+    assert app_module.get_conversation("U1")["step"] == app_module.Step.PRIORITY
+
+
+def test_messages_while_creating_get_a_reply(app_module, monkeypatch):
+    replies, _ = capture_replies(app_module, monkeypatch)
+    app_module.update_conversation("U1", step=app_module.Step.CREATING, creating_until=app_module.time.time() + 60)
+
+    post_message(app_module.app.test_client(), "E1", "hello?")
+
+    assert replies == ["⏳ Still creating your last issue; I'll reply here when it's done."]
+
+
+def test_stale_creating_state_resets(app_module, monkeypatch):
+    replies, _ = capture_replies(app_module, monkeypatch)
+    app_module.update_conversation("U1", step=app_module.Step.CREATING, creating_until=0)
+
+    post_message(app_module.app.test_client(), "E1", "hello")
+
+    assert replies == ["📝 What is the task summary?"]
+    assert app_module.get_conversation("U1")["step"] == app_module.Step.SUMMARY
+
+
+def test_async_slack_failures_are_logged(app_module, monkeypatch, caplog):
+    def send_slack_message(channel_id, message):
+        raise ConnectionError("slack down")
+
+    monkeypatch.setattr(app_module, "send_slack_message", send_slack_message)
+
+    app_module.send_slack_message_async("C1", "hi")
+    app_module.slack_executor.shutdown(wait=True)
+
+    assert "Failed to send Slack message" in caplog.text
+    assert "slack down" in caplog.text
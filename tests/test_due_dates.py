@@ -0,0 +1,40 @@
+from datetime import date
+
+import pytest
+
+THURSDAY = date(2026, 10, 15)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2030-01-15", "2030-01-15"),
+    ("2025-13-01", ""),
+    ("2025-02-30", ""),
+    ("today", "2026-10-15"),
+    ("eod", "2026-10-15"),
+    ("tomorrow", "2026-10-16"),
+    ("tmrw", "2026-10-16"),
+    ("day after tomorrow", "2026-10-17"),
+    ("next week", "2026-10-22"),
+    ("friday", "2026-10-16"),
+    ("this friday", "2026-10-16"),
+    ("by fri", "2026-10-16"),
+    ("eod friday", "2026-10-16"),
+    ("next friday", "2026-10-23"),
+    ("thursday", "2026-10-22"),
+    ("next thursday", "2026-10-29"),
+    ("monday", "2026-10-19"),
+    ("July 2, 2025", None),
+    ("last friday", None),
+])
+def test_fast_due(app_module, text, expected):
+    assert app_module._fast_due(text, THURSDAY) == expected
+
+
+def test_invalid_iso_date_is_not_reparsed(app_module):
+    assert app_module._parse_due("2025-13-01", THURSDAY) is None
+
+
+def test_parse_due_normalizes_and_falls_back(app_module):
+    assert app_module.parse_due("  TOMORROW ") == app_module._parse_due("tomorrow", date.today())
+    assert app_module.parse_due("July 2, 2025") == "2025-07-02"
+    assert app_module.parse_due("blah") is None
@@ -0,0 +1,124 @@
+import json
+import threading
+from concurrent.futures import Future
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, text=""):
+        self.status_code = status_code
+        self._body = body
+        self.text = text if body is None else json.dumps(body)
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("not JSON")
+        return self._body
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def post(self, url, json=None):
+        self.calls.append((url, json))
+        return self.response
+
+
+def make_batch(*summaries):
+    return [({"summary": s}, Future()) for s in summaries]
+
+
+def results(batch):
+    return [future.result(timeout=0) for _, future in batch]
+
+
+def test_single_issue_uses_fast_path(app_module, monkeypatch):
+    session = FakeSession(FakeResponse(201, {"key": "BT-7"}))
+    monkeypatch.setattr(app_module, "jira_session", session)
+    batch = make_batch("one")
+
+    app_module._post_jira_batch(batch)
+
+    assert session.calls[0][0].endswith("/rest/api/3/issue")
+    assert session.calls[0][1] == {"fields": {"summary": "one"}}
+    assert results(batch) == [("BT-7", None)]
+
+
+def test_bulk_response_maps_errors_and_keys_in_order(app_module, monkeypatch):
+    body = {
+        "issues": [{"key": "BT-1"}, {"key": "BT-3"}],
+        "errors": [{"failedElementNumber": 1, "elementErrors": {"errors": {"summary": "bad"}}}]
+    }
+    session = FakeSession(FakeResponse(201, body))
+    monkeypatch.setattr(app_module, "jira_session", session)
+    batch = make_batch("a", "b", "c")
+
+    app_module._post_jira_batch(batch)
+
+    assert session.calls[0][0].endswith("/rest/api/3/issue/bulk")
+    assert len(session.calls[0][1]["issueUpdates"]) == 3
+    assert results(batch) == [
+        ("BT-1", None),
+        (None, json.dumps({"errors": {"summary": "bad"}})),
+        ("BT-3", None)
+    ]
+
+
+def test_bulk_non_json_error_fails_every_item(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "jira_session", FakeSession(FakeResponse(502, text="Bad Gateway")))
+    batch = make_batch("a", "b")
+
+    app_module._post_jira_batch(batch)
+
+    assert results(batch) == [(None, "Bad Gateway"), (None, "Bad Gateway")]
+
+
+def test_cancelled_items_are_not_posted(app_module, monkeypatch):
+    session = FakeSession(FakeResponse(201, {"key": "BT-2"}))
+    monkeypatch.setattr(app_module, "jira_session", session)
+    batch = make_batch("gave up", "kept")
+    batch[0][1].cancel()
+
+    app_module._post_jira_batch(batch)
+
+    assert [payload for _, payload in session.calls] == [{"fields": {"summary": "kept"}}]
+    assert batch[1][1].result(timeout=0) == ("BT-2", None)
+
+
+def idle_worker(app_module, monkeypatch):
+    # A live stand-in worker that never drains the queue
+    stop = threading.Event()
+    worker = threading.Thread(target=stop.wait, daemon=True)
+    worker.start()
+    monkeypatch.setattr(app_module, "_jira_worker", worker)
+    return stop
+
+
+def test_timed_out_issue_is_cancelled_before_posting(app_module, monkeypatch):
+    stop = idle_worker(app_module, monkeypatch)
+    monkeypatch.setattr(app_module, "JIRA_RESULT_TIMEOUT", 0.01)
+    session = FakeSession(FakeResponse(201, {"key": "BT-9"}))
+    monkeypatch.setattr(app_module, "jira_session", session)
+
+    assert app_module.create_jira_issue({"summary": "slow"}) == (None, "Timed out waiting for Jira.")
+
+    app_module._post_jira_batch([app_module._jira_queue.get_nowait()])
+    assert session.calls == []
+    stop.set()
+
+
+def test_timeout_while_posting_reports_unknown_outcome(app_module, monkeypatch):
+    stop = idle_worker(app_module, monkeypatch)
+    monkeypatch.setattr(app_module, "JIRA_RESULT_TIMEOUT", 0.2)
+    outcome = []
+    caller = threading.Thread(target=lambda: outcome.append(app_module.create_jira_issue({"summary": "slow"})))
+    caller.start()
+
+    # Simulate the worker picking the issue up but never finishing the POST
+    _, future = app_module._jira_queue.get(timeout=1)
+    assert future.set_running_or_notify_cancel()
+    caller.join()
+
+    assert outcome == [(None, None)]
+    stop.set()
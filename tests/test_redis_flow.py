@@ -0,0 +1,60 @@
+import sys
+
+import pytest
+
+from conftest import capture_replies, load_app, post_message
+
+
+@pytest.fixture
+def redis_app(monkeypatch):
+    redis = pytest.importorskip("redis")
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # redis-py releases locks with a Lua script
+
+    # Route the app's real connection pool to an in-memory fake server
+    server = fakeredis.FakeServer()
+    real_from_url = redis.BlockingConnectionPool.from_url
+
+    def from_url(url, **kwargs):
+        return real_from_url(url, connection_class=fakeredis.FakeRedisConnection, server=server, **kwargs)
+
+    monkeypatch.setattr(redis.BlockingConnectionPool, "from_url", from_url)
+    monkeypatch.setenv("USE_REDIS", "1")
+    monkeypatch.setenv("SKIP_DOTENV", "1")
+    monkeypatch.setenv("SLACK_VERIFY_SIGNATURES", "0")
+
+    app = load_app()
+    yield app
+    app.executor.shutdown(wait=True)
+    sys.modules.pop("app", None)
+
+
+def test_four_message_flow_with_redis(redis_app, monkeypatch):
+    replies, created = capture_replies(redis_app, monkeypatch)
+
+    client = redis_app.app.test_client()
+    for i, text in enumerate(["hi", "Fix login", "2030-01-15", "high"]):
+        assert post_message(client, f"E{i}", text).status_code == 200
+    redis_app.executor.shutdown(wait=True)
+
+    assert replies == [
+        "📝 What is the task summary?",
+        "📅 When is it due?",
+        "❗ How important is it? (e.g., Low, Medium, High)",
+        "✅ Created Jira issue *BT-1*: Fix login"
+    ]
+    assert created[0]["summary"] == "Fix login"
+    assert created[0]["duedate"] == "2030-01-15"
+    assert created[0]["priority"] == {"name": "High"}
+    assert not redis_app.r.exists(redis_app._convo_key("U1"))
+
+
+def test_stale_creating_state_resets_with_redis(redis_app, monkeypatch):
+    replies, _ = capture_replies(redis_app, monkeypatch)
+    # A finalizer that died mid-create left the user in CREATING past its deadline
+    redis_app.update_conversation("U1", step=redis_app.Step.CREATING, summary="x", creating_until=0)
+
+    post_message(redis_app.app.test_client(), "E1", "hello")
+
+    assert replies == ["📝 What is the task summary?"]
+    assert redis_app.get_conversation("U1")["step"] == redis_app.Step.SUMMARY
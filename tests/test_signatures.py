@@ -0,0 +1,61 @@
+import hashlib
+import hmac
+import json
+import sys
+import time
+
+import pytest
+
+from conftest import load_app
+
+BODY = json.dumps({"type": "url_verification", "challenge": "x"}).encode()
+
+
+@pytest.fixture
+def signed_app(monkeypatch):
+    def load(**env):
+        monkeypatch.setenv("SKIP_DOTENV", "1")
+        monkeypatch.delenv("USE_REDIS", raising=False)
+        monkeypatch.delenv("SLACK_SIGNING_SECRET", raising=False)
+        monkeypatch.delenv("SLACK_VERIFY_SIGNATURES", raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return load_app()
+    yield load
+    sys.modules.pop("app", None)
+
+
+def sign(secret, body, timestamp=None):
+    timestamp = timestamp or str(int(time.time()))
+    mac = hmac.new(secret, b"v0:" + timestamp.encode() + b":" + body, hashlib.sha256).hexdigest()
+    return {"X-Slack-Request-Timestamp": timestamp, "X-Slack-Signature": "v0=" + mac}
+
+
+def post(app, headers=None):
+    return app.app.test_client().post("/slack/events", data=BODY, headers=headers or {})
+
+
+def test_valid_signature_is_accepted(signed_app):
+    app = signed_app(SLACK_SIGNING_SECRET="sek")
+    assert post(app, sign(b"sek", BODY)).status_code == 200
+
+
+@pytest.mark.parametrize("headers", [
+    {},
+    sign(b"wrong", BODY),
+    sign(b"sek", BODY, timestamp=str(int(time.time()) - 600)),
+    {"X-Slack-Request-Timestamp": str(int(time.time())), "X-Slack-Signature": "v0=\xe9"},
+])
+def test_bad_signatures_are_rejected(signed_app, headers):
+    app = signed_app(SLACK_SIGNING_SECRET="sek")
+    assert post(app, headers).status_code == 401
+
+
+def test_missing_secret_fails_closed(signed_app):
+    app = signed_app()
+    assert post(app, sign(b"", BODY)).status_code == 401
+
+
+def test_verification_can_be_disabled_for_local_dev(signed_app):
+    app = signed_app(SLACK_VERIFY_SIGNATURES="0")
+    assert post(app).status_code == 200